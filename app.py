@@ -1,8 +1,19 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
+from pyarrow import csv as pacsv
 import os
 import re
+import glob
+
+# 'Score: X | Notes: Y' cells; either part may be missing, so a bare score or bare notes still parses
+SCORE_NOTES_RE = re.compile(r'Score:\s*(\d+)?(?:.*?Notes:\s*(.*))?|Notes:\s*(.*)', re.S)
+# First GitHub repo URL in a notes string (stops at the comma separating multiple URLs)
+GITHUB_URL_RE = re.compile(r'(https?://github\.com/[^,\s]+)')
+# Reproducibility statuses, lowest to highest; Overall Status is an ordered categorical over these
+STATUS_LABELS = ['Not Reproducible', 'Issues Present', 'Partially Reproducible', 'Highly Reproducible']
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -13,14 +24,15 @@ st.set_page_config(
 )
 
 # --- Data Loading (robust for scorecard_summary.csv) ---
-@st.cache_data
-def load_data():
-    file_path = 'data/scorecard_summary.csv'
-    if not os.path.exists(file_path):
-        st.error(f"Error: Data file not found at {file_path}. Please ensure 'scorecard_summary.csv' is in the 'data/' folder of your repository.")
-        st.stop()
+def parse_scorecard(file_path):
     try:
-        df_raw = pd.read_csv(file_path, sep=',', header=0, encoding='utf-8', engine='python', quotechar='"')
+        # Multi-threaded Arrow parse, handed to pandas as Arrow-backed columns
+        table = pacsv.read_csv(
+            file_path,
+            read_options=pacsv.ReadOptions(use_threads=True),
+            parse_options=pacsv.ParseOptions(delimiter=','),
+        )
+        df_raw = table.to_pandas(types_mapper=pd.ArrowDtype)
     except Exception as e:
         st.error(f"Failed to load CSV: {e}")
         st.stop()
@@ -29,27 +41,19 @@ def load_data():
     paper_file_col = 'Paper File'
     df = pd.DataFrame()
     if paper_file_col in df_raw.columns:
-        df['Paper ID'] = df_raw[paper_file_col].astype(str).apply(lambda x: x.replace('.pdf','').strip())
-        df['Paper Title'] = df_raw[paper_file_col].astype(str).apply(lambda x: x.replace('.pdf','').replace('_',' ').strip())
+        stem = df_raw[paper_file_col].astype('string').str.removesuffix('.pdf').str.strip()
+        df['Paper ID'] = stem
+        df['Paper Title'] = stem.str.replace('_', ' ', regex=False).str.strip()
     else:
         df['Paper ID'] = [f"P{i:03d}" for i in range(1, len(df_raw)+1)]
         df['Paper Title'] = [f"Paper {i} Title (Placeholder)" for i in range(1, len(df_raw)+1)]
+    # Lowercased copies for the sidebar search, so it doesn't re-lowercase on every keystroke
+    df['_title_lc'] = df['Paper Title'].str.lower()
+    df['_id_lc'] = df['Paper ID'].str.lower()
+    # 'Title (ID)' label for the paper dropdown, built once instead of on every rerun
+    df['_dropdown_label'] = df['Paper Title'] + ' (' + df['Paper ID'] + ')'
 
-    # --- Step 2: Parse 'Score: X | Notes: Y' strings robustly ---
-    def parse_score(s):
-        # More robust: find first integer after 'Score:'
-        m = re.search(r'Score:\s*([0-9]+)', str(s).strip())
-        if m:
-            return int(m.group(1))
-        return 0
-    def parse_notes(s):
-        m = re.search(r'Notes:\s*(.*)', str(s))
-        return m.group(1).strip() if m else ''
-    def extract_first_github_url(notes):
-        # Extract the first GitHub repo URL from the notes string
-        matches = re.findall(r'https?://github.com/[^,\s]+', str(notes))
-        return matches[0] if matches else 'N/A'
-
+    # --- Step 2: Parse 'Score: X | Notes: Y' strings (vectorized) ---
     score_cols = [
         ('Paper Availability', 'Paper Availability'),
         ('Availability of Code and Software', 'Code Availability'),
@@ -63,8 +67,9 @@ def load_data():
     ]
     for csv_col, short in score_cols:
         if csv_col in df_raw.columns:
-            df[f'{short} Score'] = df_raw[csv_col].apply(parse_score)
-            df[f'{short} Notes'] = df_raw[csv_col].apply(parse_notes)
+            parsed = df_raw[csv_col].astype('string').str.extract(SCORE_NOTES_RE)
+            df[f'{short} Score'] = parsed[0].fillna('0').astype('int8')
+            df[f'{short} Notes'] = parsed[1].fillna(parsed[2]).str.strip().fillna('')
         else:
             df[f'{short} Score'] = 0
             df[f'{short} Notes'] = ''
@@ -78,6 +83,9 @@ def load_data():
     df['Documentation & Transparency Score'] = df['Documentation Quality Score']
     df['Data & Model Reuse Score'] = df['Dataset Availability Score']
     df['Community Engagement Score'] = 0  # Not in CSV, placeholder
+    # Scores are 0-5, so keep the numeric hot set (placeholders included) packed as int8
+    score_score_cols = [c for c in df.columns if c.endswith(' Score')]
+    df[score_score_cols] = df[score_score_cols].astype('int8')
     # Calculate overall score as sum of main categories, normalized to 100
     df['Overall Score (Raw)'] = (
         df['Code & Environment Score'] +
@@ -86,24 +94,107 @@ def load_data():
         df['Community Engagement Score']
     )
     max_total = code_env_max + docs_max + data_model_max + community_max  # 16
-    df['Overall Score (100)'] = (df['Overall Score (Raw)'] / max_total * 100).round(1)
+    df['Overall Score (100)'] = (df['Overall Score (Raw)'].astype('float32') / max_total * 100).round(1)
     # Status logic: 80+ = Highly, 50-79 = Partially, 20-49 = Issues, 0-19 = Not
-    def status_from_score(score):
-        if score >= 80:
-            return 'Highly Reproducible'
-        elif score >= 50:
-            return 'Partially Reproducible'
-        elif score >= 20:
-            return 'Issues Present'
-        else:
-            return 'Not Reproducible'
-    df['Overall Status'] = df['Overall Score (100)'].apply(status_from_score)
-    df['Conference'] = ['ICSE 2023', 'SC24'] * (len(df) // 2) + ['ICSE 2023'] * (len(df) % 2)
-    df['Paper Link'] = df['Paper ID'].apply(lambda x: f"https://example.com/papers/{x}.pdf")
-    df['Code Link'] = df['Code Availability Notes'].apply(extract_first_github_url)
+    df['Overall Status'] = pd.cut(
+        df['Overall Score (100)'],
+        bins=[-np.inf, 20, 50, 80, np.inf],
+        right=False,
+        labels=STATUS_LABELS
+    )
+    # Alternate ICSE 2023 / SC24 by row; built straight from codes as a categorical, which keeps
+    # isin/unique/value_counts cheap (Overall Status is already one via pd.cut)
+    df['Conference'] = pd.Categorical.from_codes(np.arange(len(df)) & 1, categories=['ICSE 2023', 'SC24'])
+    df['Paper Link'] = 'https://example.com/papers/' + df['Paper ID'] + '.pdf'
+    df['Code Link'] = df['Code Availability Notes'].str.extract(GITHUB_URL_RE, expand=False).fillna('N/A')
     return df
 
-df = load_data()
+@st.cache_data
+def load_data():
+    file_path = 'data/scorecard_summary.csv'
+    if not os.path.exists(file_path):
+        st.error(f"Error: Data file not found at {file_path}. Please ensure 'scorecard_summary.csv' is in the 'data/' folder of your repository.")
+        st.stop()
+    # The parsed frame is cached as Parquet next to the CSV, keyed by its mtime+size (and this script's mtime,
+    # so edits to parse_scorecard invalidate it), letting cold starts skip re-parsing
+    stat = os.stat(file_path)
+    cache_path = f'data/.scorecard_summary.{stat.st_mtime_ns}_{stat.st_size}_{os.stat(__file__).st_mtime_ns}.parquet'
+    df = None
+    if os.path.exists(cache_path):
+        try:
+            df = pd.read_parquet(cache_path)
+        except Exception:
+            pass  # Unreadable cache, rebuild from the CSV below
+    if df is None:
+        df = parse_scorecard(file_path)
+        try:
+            for stale in glob.glob('data/.scorecard_summary.*.parquet'):
+                os.remove(stale)
+            df.to_parquet(cache_path, compression='zstd')
+        except Exception:
+            pass  # Read-only deployments just fall back to parsing the CSV each cold start
+    # Paper ID is the lookup key below, so keep only the first row for a duplicated Paper File
+    df = df.drop_duplicates('Paper ID').reset_index(drop=True)
+    # Notes are only read for the selected paper, so keep them off the main frame in a dict keyed by Paper ID
+    notes_cols = [c for c in df.columns if c.endswith(' Notes')]
+    notes_by_id = dict(zip(df['Paper ID'], df[notes_cols].to_dict('records')))
+    df = df.drop(columns=notes_cols)
+    # Paper ID-indexed view for O(1) lookup of the selected paper
+    df_by_id = df.set_index('Paper ID', drop=False)
+    return df, df_by_id, notes_by_id
+
+# --- Filtering (cached per filter state, so reruns that don't touch the filters skip the masks) ---
+# statuses/conferences are None when every option is selected; inactive filters build no mask at all
+@st.cache_data
+def apply_filters(df, min_score, statuses, conferences, query):
+    masks = []
+    if min_score > 0:
+        masks.append(df['Overall Score (100)'] >= min_score)
+    if statuses is not None:
+        masks.append(df['Overall Status'].isin(statuses))
+    if conferences is not None:
+        masks.append(df['Conference'].isin(conferences))
+    if query:
+        masks.append(
+            df['_title_lc'].str.contains(query, regex=False, na=False) |
+            df['_id_lc'].str.contains(query, regex=False, na=False)
+        )
+    if not masks:
+        return df
+    # Combine as plain numpy bool arrays (no index alignment) and select rows positionally in one pass
+    mask = np.logical_and.reduce([m.to_numpy(dtype=bool, na_value=False) for m in masks])
+    return df.iloc[np.flatnonzero(mask)]
+
+# --- Scorecard rendering (static per paper, so built once per Paper ID and reused on reselection) ---
+STATUS_COLOR = {'Highly Reproducible':'#22c55e','Partially Reproducible':'#facc15','Issues Present':'#f97316','Not Reproducible':'#ef4444'}
+
+def progress_bar_html(fraction):
+    # Inline-CSS stand-in for st.progress, so bars can live inside a single markdown emit
+    return (f"<div style='background:#e5e7eb;border-radius:0.5rem;height:0.5rem;margin:0.6rem 0;'>"
+            f"<div style='width:{max(0.0, min(float(fraction), 1.0)) * 100:.1f}%;background:#ff4b4b;height:100%;border-radius:0.5rem;'></div>"
+            f"</div>")
+
+@st.cache_data
+def render_scorecard_html(paper_id):
+    paper = df_by_id.loc[paper_id]
+    # One HTML block (no blank lines) so the card div actually wraps its contents in a single st.markdown
+    return "".join([
+        "<div style='background:#f8fafc;padding:1.5rem 1.5rem 1rem 1.5rem;border-radius:1rem;box-shadow:0 2px 8px rgba(0,0,0,0.04);'>",
+        f"<h3 style='margin-bottom:0.5rem;'>{paper['Paper Title']}</h3>",
+        f"<div><span style='font-size:1.1rem;font-weight:600;'>Paper ID:</span> {paper['Paper ID']}</div>",
+        f"<div><span style='font-size:1.1rem;font-weight:600;'>Conference:</span> {paper.get('Conference', 'N/A')}</div>",
+        f"<div><span style='font-size:1.1rem;font-weight:600;'>Overall Score:</span> {paper['Overall Score (100)']:.1f}/100</div>",
+        # Status chip
+        f"<div style='margin-top:0.6rem;'><span style='padding:0.3em 0.9em;border-radius:1em;background:{STATUS_COLOR.get(paper['Overall Status'],'#e5e7eb')};color:#fff;font-weight:600;margin-right:0.5em;'>{paper['Overall Status']}</span></div>",
+        # Overall score progress bar
+        progress_bar_html(paper['Overall Score (100)'] / 100),
+        f"<a href='{paper.get('Code Link', '#')}' target='_blank'>View GitHub Repository for this Paper</a>",
+        "<hr style='margin:1rem 0;'>",
+        "<b>Score Breakdown by Category:</b>",
+        "</div>",
+    ])
+
+df, df_by_id, notes_by_id = load_data()
 
 # --- Sidebar Filters ---
 st.sidebar.header("Filter Papers")
@@ -113,7 +204,7 @@ min_score = st.sidebar.slider("Minimum Overall Score (Points)", 0, 5, 0)
 
 all_statuses = df['Overall Status'].dropna().unique().tolist()
 if not all_statuses:
-    all_statuses = ['Highly Reproducible', 'Partially Reproducible', 'Issues Present', 'Not Reproducible']
+    all_statuses = STATUS_LABELS[::-1]
 selected_statuses = st.sidebar.multiselect(
     "Filter by Status",
     options=all_statuses,
@@ -125,19 +216,18 @@ selected_conferences = st.sidebar.multiselect(
     options=all_conferences,
     default=all_conferences
 )
-filtered_df = df[
-    (df['Overall Score (100)'] >= min_score) &
-    (df['Overall Status'].isin(selected_statuses)) &
-    (df['Conference'].isin(selected_conferences))
-]
-if search_query:
-    filtered_df = filtered_df[
-        filtered_df['Paper Title'].str.lower().str.contains(search_query) |
-        filtered_df['Paper ID'].str.lower().str.contains(search_query)
-    ]
+filtered_df = apply_filters(
+    df,
+    min_score,
+    tuple(selected_statuses) if len(selected_statuses) < len(all_statuses) else None,
+    tuple(selected_conferences) if len(selected_conferences) < len(all_conferences) else None,
+    search_query
+)
 
-# Fallback: If filtered_df is empty, show warning and reset filters
-if filtered_df.empty:
+# Fallback: If filtered_df is empty, show warning and reset filters (unless the scorecard itself has no papers)
+if df.empty:
+    st.info("The scorecard data doesn't contain any papers yet.")
+elif filtered_df.empty:
     st.warning("No papers match the current filters. Resetting filters to show all papers.")
     filtered_df = df.copy()
     selected_statuses = all_statuses
@@ -148,14 +238,19 @@ st.markdown("<h1 style='font-size:2.2rem;font-weight:800;margin-bottom:0.5rem;'>
 st.markdown("<div style='font-size:1.1rem;margin-bottom:1.5rem;'>Welcome to the CodeRunners portal for our SGX3 ADMI hackathon project! This platform evaluates and compares the reproducibility of LLM papers from ICSE 2023 and SC24. Use the filters on the left to explore the papers.</div>", unsafe_allow_html=True)
 
 # --- Metrics Row ---
+summary = {
+    'mean': filtered_df['Overall Score (100)'].mean(),
+    'counts': filtered_df['Overall Status'].value_counts(),
+    'total': len(df),
+}
 with st.container():
     mcol1, mcol2, mcol3 = st.columns(3)
     with mcol1:
-        st.metric(label="Average Score", value=f"{filtered_df['Overall Score (100)'].mean():.1f}/100", delta=None, help="All scores are normalized to a 100-point scale.")
+        st.metric(label="Average Score", value=f"{summary['mean']:.1f}/100" if len(filtered_df) else "N/A", delta=None, help="All scores are normalized to a 100-point scale.")
     with mcol2:
-        st.metric(label="Highly Reproducible", value=f"{len(filtered_df[filtered_df['Overall Status'] == 'Highly Reproducible'])}")
+        st.metric(label="Highly Reproducible", value=f"{summary['counts'].get('Highly Reproducible', 0)}")
     with mcol3:
-        st.metric(label="Total Papers", value=f"{len(df)}")
+        st.metric(label="Total Papers", value=f"{summary['total']}")
 
 st.markdown("<hr style='margin:1.5rem 0;'>", unsafe_allow_html=True)
 
@@ -164,58 +259,44 @@ with st.container():
     tcol1, tcol2 = st.columns([2, 3], gap="large")
     with tcol1:
         st.markdown("<h3 style='margin-bottom:0.5rem;'>Papers</h3>", unsafe_allow_html=True)
-        # Show only top 5 papers by default, with a 'View All' button
+        # Show only top 5 papers by default, with a 'View All' toggle
         if 'show_all_papers' not in st.session_state:
             st.session_state['show_all_papers'] = False
         top_n = 5
-        if not st.session_state['show_all_papers']:
-            display_df = filtered_df[['Paper ID', 'Paper Title', 'Overall Score (100)', 'Overall Status', 'Conference']].reset_index(drop=True).head(top_n)
-        else:
-            display_df = filtered_df[['Paper ID', 'Paper Title', 'Overall Score (100)', 'Overall Status', 'Conference']].reset_index(drop=True)
+        # Index is hidden in the table anyway, so no reset_index; cut rows with head() before picking
+        # columns so only top_n rows are copied
+        display_rows = filtered_df if st.session_state['show_all_papers'] else filtered_df.head(top_n)
+        display_df = display_rows.loc[:, ['Paper ID', 'Paper Title', 'Overall Score (100)', 'Overall Status', 'Conference']]
+        # Dropdown options are Paper IDs; their precomputed labels come from the same rows, so each lookup is one string
+        paper_ids = display_df['Paper ID'].tolist()
+        dropdown_labels = dict(zip(paper_ids, display_rows['_dropdown_label']))
         st.dataframe(
             display_df,
             use_container_width=True,
             hide_index=True,
         )
-        if not st.session_state['show_all_papers'] and len(filtered_df) > top_n:
-            if st.button('View All Papers'):
-                st.session_state['show_all_papers'] = True
-                # Ensure selected paper is valid after rerun
-                if 'selected_paper' not in st.session_state or st.session_state['selected_paper'] not in dropdown_options:
-                    st.session_state['selected_paper'] = dropdown_options[0] if len(dropdown_options) > 0 else None
-                st.experimental_rerun()
-        elif st.session_state['show_all_papers'] and len(filtered_df) > top_n:
-            if st.button('Show Less'):
-                st.session_state['show_all_papers'] = False
-                if 'selected_paper' not in st.session_state or st.session_state['selected_paper'] not in dropdown_options:
-                    st.session_state['selected_paper'] = dropdown_options[0] if len(dropdown_options) > 0 else None
-                st.experimental_rerun()
-        dropdown_options = display_df['Paper Title'] + " (" + display_df['Paper ID'] + ")"
+        # Bound to session state, so toggling triggers a single rerun with the new value. Always rendered
+        # (just disabled when there's nothing more to show), since Streamlit drops the key of an unrendered widget
+        st.checkbox('View All Papers', key='show_all_papers', disabled=len(filtered_df) <= top_n)
         # Preserve selected paper across reruns
-        if 'selected_paper' not in st.session_state or st.session_state['selected_paper'] not in dropdown_options:
-            st.session_state['selected_paper'] = dropdown_options[0] if len(dropdown_options) > 0 else None
-        selected_paper = st.selectbox("Select a paper for details:", dropdown_options, key="paper_select", index=dropdown_options.index(st.session_state['selected_paper']) if st.session_state['selected_paper'] in dropdown_options else 0)
+        if 'selected_paper' not in st.session_state or st.session_state['selected_paper'] not in paper_ids:
+            st.session_state['selected_paper'] = paper_ids[0] if paper_ids else None
+        selected_paper = st.selectbox(
+            "Select a paper for details:",
+            paper_ids,
+            format_func=lambda pid: dropdown_labels[pid],
+            key="paper_select",
+            index=paper_ids.index(st.session_state['selected_paper']) if st.session_state['selected_paper'] in paper_ids else 0
+        )
         st.session_state['selected_paper'] = selected_paper
     with tcol2:
         try:
             if st.session_state['selected_paper']:
-                selected_id = st.session_state['selected_paper'].split("(")[-1].replace(")", "").strip()
-                # Only show details if the paper exists in the filtered DataFrame
-                if selected_id in filtered_df['Paper ID'].values:
-                    selected_paper_data = filtered_df[filtered_df['Paper ID'] == selected_id].iloc[0]
-                    st.markdown(f"<div style='background:#f8fafc;padding:1.5rem 1.5rem 1rem 1.5rem;border-radius:1rem;box-shadow:0 2px 8px rgba(0,0,0,0.04);'>", unsafe_allow_html=True)
-                    st.markdown(f"<h3 style='margin-bottom:0.5rem;'>{selected_paper_data['Paper Title']}</h3>", unsafe_allow_html=True)
-                    st.markdown(f"<span style='font-size:1.1rem;font-weight:600;'>Paper ID:</span> {selected_paper_data['Paper ID']}  ", unsafe_allow_html=True)
-                    st.markdown(f"<span style='font-size:1.1rem;font-weight:600;'>Conference:</span> {selected_paper_data.get('Conference', 'N/A')}  ", unsafe_allow_html=True)
-                    st.markdown(f"<span style='font-size:1.1rem;font-weight:600;'>Overall Score:</span> {selected_paper_data['Overall Score (100)']}/100  ", unsafe_allow_html=True)
-                    # Status chip
-                    status_color = {'Highly Reproducible':'#22c55e','Partially Reproducible':'#facc15','Issues Present':'#f97316','Not Reproducible':'#ef4444'}
-                    st.markdown(f"<span style='padding:0.3em 0.9em;border-radius:1em;background:{status_color.get(selected_paper_data['Overall Status'],'#e5e7eb')};color:#fff;font-weight:600;margin-right:0.5em;'>{selected_paper_data['Overall Status']}</span>", unsafe_allow_html=True)
-                    # Overall score progress bar
-                    st.progress(selected_paper_data['Overall Score (100)'] / 100)
-                    st.markdown(f"<a href='{selected_paper_data.get('Code Link', '#')}' target='_blank'>View GitHub Repository for this Paper</a>", unsafe_allow_html=True)
-                    st.markdown("<hr style='margin:1rem 0;'>", unsafe_allow_html=True)
-                    st.markdown("<b>Score Breakdown by Category:</b>", unsafe_allow_html=True)
+                selected_id = st.session_state['selected_paper']
+                # Only show details if the paper is among the filtered rows offered in the dropdown
+                if selected_id in paper_ids:
+                    selected_paper_data = df_by_id.loc[selected_id]
+                    st.markdown(render_scorecard_html(selected_id), unsafe_allow_html=True)
                     max_scores = {
                         'Code & Environment Score': 4,
                         'Documentation & Transparency Score': 4,
@@ -223,35 +304,11 @@ with st.container():
                         'Community Engagement Score': 4
                     }
                     categories = list(max_scores.keys())
-                    # First row (first two categories)
-                    cols1 = st.columns(2)
-                    for idx in range(2):
-                        category_col = categories[idx]
-                        max_pts = max_scores[category_col]
-                        with cols1[idx]:
-                            if category_col in selected_paper_data.index:
-                                score = selected_paper_data[category_col]
-                                pct = int((score/max_pts)*100) if max_pts else 0
-                                st.markdown(f"<div style='background-color:#f8fafc;padding:1.1rem 0.7rem 0.7rem 0.7rem;border-radius:1rem;box-shadow:0 2px 8px rgba(0,0,0,0.04);min-width:150px;text-align:center;'>"
-                                            f"<div style='font-size:1.08rem;font-weight:700;margin-bottom:0.3rem;color:#334155;'>"
-                                            f"{category_col.replace(' Score','')}" 
-                                            f"</div>"
-                                            f"<div style='font-size:1.1rem;font-weight:600;margin-bottom:0.2rem;'>{score}/{max_pts} <span style='color:#6366f1;font-weight:600;'>({pct}%)</span></div>"
-                                            f"</div>", unsafe_allow_html=True)
-                                st.progress(score / max_pts)
-                            else:
-                                st.markdown(f"<div style='background-color:#f8fafc;padding:1.1rem 0.7rem 0.7rem 0.7rem;border-radius:1rem;min-width:150px;text-align:center;'>"
-                                            f"<div style='font-size:1.08rem;font-weight:700;margin-bottom:0.3rem;color:#334155;'>"
-                                            f"{category_col.replace(' Score','')}" 
-                                            f"</div>"
-                                            f"<div>Data not available.</div>"
-                                            f"</div>", unsafe_allow_html=True)
-                    # Second row (last two categories)
-                    cols2 = st.columns(2)
-                    for idx in range(2, 4):
-                        category_col = categories[idx]
+                    # 2x2 grid: categories fill the first row, then the second
+                    rows = [st.columns(2), st.columns(2)]
+                    for idx, category_col in enumerate(categories):
                         max_pts = max_scores[category_col]
-                        with cols2[idx-2]:
+                        with rows[idx // 2][idx % 2]:
                             if category_col in selected_paper_data.index:
                                 score = selected_paper_data[category_col]
                                 pct = int((score/max_pts)*100) if max_pts else 0
@@ -269,7 +326,6 @@ with st.container():
                                             f"</div>"
                                             f"<div>Data not available.</div>"
                                             f"</div>", unsafe_allow_html=True)
-                    st.markdown("<b>Detailed Notes:</b>", unsafe_allow_html=True)
                     note_display_map = {
                         "Paper Availability Notes": "Paper Availability",
                         "Code Availability Notes": "Code & Environment",
@@ -281,14 +337,18 @@ with st.container():
                         "Reproducibility Notes": "Overall Reproducibility",
                         "Overall Rating Notes": "Overall Rating"
                     }
-                    found_notes = False
-                    for note_col, display_name in note_display_map.items():
-                        if note_col in selected_paper_data.index and pd.notna(selected_paper_data[note_col]) and selected_paper_data[note_col] != "":
-                            st.markdown(f"<div style='margin-bottom:0.3rem;'><b>{display_name}:</b> <span style='color:#334155;'>{selected_paper_data[note_col]}</span></div>", unsafe_allow_html=True)
-                            found_notes = True
-                    if not found_notes:
+                    paper_notes = notes_by_id.get(selected_id, {})
+                    # All notes go out in one markdown element rather than one per note
+                    note_parts = [
+                        f"<div style='margin-bottom:0.3rem;'><b>{display_name}:</b> <span style='color:#334155;'>{note}</span></div>"
+                        for note_col, display_name in note_display_map.items()
+                        if pd.notna(note := paper_notes.get(note_col)) and note != ""
+                    ]
+                    if note_parts:
+                        st.markdown("<b>Detailed Notes:</b>" + "".join(note_parts), unsafe_allow_html=True)
+                    else:
+                        st.markdown("<b>Detailed Notes:</b>", unsafe_allow_html=True)
                         st.info("No detailed notes available for this paper in the current data.")
-                    st.markdown("</div>", unsafe_allow_html=True)
                 else:
                     st.info("Selected paper is not available in the current filter. Please select another paper.")
             else:
@@ -299,24 +359,39 @@ with st.container():
 st.markdown("<hr style='margin:2rem 0;'>", unsafe_allow_html=True)
 
 # --- Visualizations ---
+# Both charts only depend on the unfiltered (cached) df, so build each figure once and reuse it across reruns;
+# each builder takes just the column it plots, which keeps the cache-key hash small
+@st.cache_resource
+def build_score_hist(scores):
+    # Bin server-side so the figure carries 10 bars rather than every raw score, keeping it flat as papers grow
+    counts, edges = np.histogram(scores, bins=10, range=(0, 100))
+    fig = go.Figure(go.Bar(x=edges[:-1] + 5, y=counts, width=10,
+                           marker_color=px.colors.qualitative.Plotly[0]))
+    fig.update_layout(title="Distribution of Overall Reproducibility Scores (%)",
+                      xaxis_title="Score (%)", yaxis_title="count",
+                      bargap=0, height=350, uirevision='keep')
+    return fig
+
+@st.cache_resource
+def build_status_pie(status_counts):
+    # value_counts on the categorical lists every status; drop the empty ones so they don't show as slices
+    status_counts = status_counts[status_counts > 0].rename_axis('Status').reset_index(name='Count')
+    fig = px.pie(status_counts, values='Count', names='Status',
+                 title="Breakdown by Reproducibility Status",
+                 color_discrete_sequence=px.colors.qualitative.Pastel,
+                 height=350)
+    fig.update_layout(uirevision='keep')
+    return fig
+
 st.markdown("<h3 style='margin-bottom:0.5rem;'>Reproducibility Trends</h3>", unsafe_allow_html=True)
-with st.container():
-    vcol1, vcol2 = st.columns(2)
-    with vcol1:
-        fig_score_dist = px.histogram(df, x="Overall Score (100)",
-                                    nbins=10, title="Distribution of Overall Reproducibility Scores (%)",
-                                    labels={"Overall Score (100)": "Score (%)"},
-                                    color_discrete_sequence=px.colors.qualitative.Plotly,
-                                    height=350)
-        st.plotly_chart(fig_score_dist, use_container_width=True)
-    with vcol2:
-        status_counts = df['Overall Status'].value_counts().reset_index()
-        status_counts.columns = ['Status', 'Count']
-        fig_status_pie = px.pie(status_counts, values='Count', names='Status',
-                            title="Breakdown by Reproducibility Status",
-                            color_discrete_sequence=px.colors.qualitative.Pastel,
-                            height=350)
-        st.plotly_chart(fig_status_pie, use_container_width=True)
+# Charts are only built and sent to the browser once opened (a collapsed st.expander would still render them)
+if st.checkbox("📈 Show reproducibility trend charts", value=False, key="show_trends"):
+    with st.container():
+        vcol1, vcol2 = st.columns(2)
+        with vcol1:
+            st.plotly_chart(build_score_hist(df['Overall Score (100)']), use_container_width=True)
+        with vcol2:
+            st.plotly_chart(build_status_pie(df['Overall Status'].value_counts()), use_container_width=True)
 
 st.markdown("<hr style='margin:2rem 0;'>", unsafe_allow_html=True)
 